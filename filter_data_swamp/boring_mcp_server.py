@@ -2,7 +2,7 @@
 """MCP server for DuckLake sessions semantic model."""
 
 from boring_semantic_layer import MCPSemanticModel
-from boring_sessions_semantic_model import sessions_sm
+from boring_sessions_semantic_model import profiler, sessions_sm
 
 # Create MCP server with the semantic model
 mcp_server = MCPSemanticModel(
@@ -10,6 +10,27 @@ mcp_server = MCPSemanticModel(
     name="DuckLake Sessions Analytics"
 )
 
+
+@mcp_server.tool()
+def get_slow_queries(limit: int = 10) -> list[dict]:
+    """Return the most recent slow semantic-model queries, newest first.
+
+    Each entry has the generated SQL, elapsed time, rows scanned versus
+    returned and the DuckDB operator plan. Queries are only recorded when
+    the server runs with BORING_QUERY_PROFILING=1.
+    """
+    return profiler.recent_slow_queries(limit)
+
+
+@mcp_server.tool()
+def get_recent_queries(limit: int = 10) -> list[dict]:
+    """Return the most recent semantic-model queries run by this server, newest first.
+
+    Unlike get_slow_queries this includes fast queries, but only covers the
+    current server process. Requires BORING_QUERY_PROFILING=1.
+    """
+    return profiler.recent_queries(limit)
+
 if __name__ == "__main__":
     # Run the server with stdio transport for Claude Desktop integration
     mcp_server.run(transport="stdio")
\ No newline at end of file
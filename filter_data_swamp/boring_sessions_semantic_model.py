@@ -1,18 +1,36 @@
 """Semantic model for sessions fact table from DuckLake."""
 
+import os
 import ibis
 from boring_semantic_layer import SemanticModel, DimensionSpec, MeasureSpec
 from pathlib import Path
+from query_profiler import QueryProfiler
 
-# Connect to local DuckDB
 SCRIPT_DIR = Path(__file__).parent.absolute()
 LOCAL_DB_PATH = SCRIPT_DIR / "filter_data_swamp.duckdb"
+LAKE_CATALOG = SCRIPT_DIR / "lake_catalog.sqlite"
+LAKE_DATA_PATH = SCRIPT_DIR / "lake_data"
 
-con = ibis.duckdb.connect(str(LOCAL_DB_PATH))
-sessions_tbl = con.table("src_sessions_fct", database="source_data")
+# Where src_sessions_fct lives: "duckdb" (local file), "ducklake" (local SQLite
+# catalog) or "motherduck" (MotherDuck-hosted DuckLake, needs MOTHERDUCK_TOKEN)
+SESSIONS_SOURCE = os.getenv("BORING_SESSIONS_SOURCE", "duckdb")
+
+if SESSIONS_SOURCE == "ducklake":
+    con = ibis.duckdb.connect()
+    con.raw_sql(f"ATTACH 'ducklake:sqlite:{LAKE_CATALOG}' AS lake (DATA_PATH '{LAKE_DATA_PATH}/', READ_ONLY)")
+    sessions_tbl = con.table("src_sessions_fct", database=("lake", "source_data"))
+elif SESSIONS_SOURCE == "motherduck":
+    con = ibis.duckdb.connect("md:")
+    sessions_tbl = con.table("src_sessions_fct", database=("ducklake_analytics", "source_data"))
+else:
+    con = ibis.duckdb.connect(str(LOCAL_DB_PATH))
+    sessions_tbl = con.table("src_sessions_fct", database="source_data")
+
+# Opt-in profiling: set BORING_QUERY_PROFILING=1 (and optionally BORING_SLOW_QUERY_MS)
+profiler = QueryProfiler.from_env(con)
 
 # Define semantic model with descriptions for MCP
-sessions_sm = SemanticModel(
+sessions_sm = profiler.wrap(SemanticModel(
     name="sessions",
     table=sessions_tbl,
     description="Google Analytics session data with user behavior, device info, and traffic sources",
@@ -113,4 +131,4 @@ sessions_sm = SemanticModel(
             description="Number of new user sessions"
         ),
     }
-)
\ No newline at end of file
+))
@@ -10,9 +10,11 @@ import json
 import ast
 from typing import Dict, Iterator, Optional
 from dlt.helpers.dbt import create_runner
+from dlt.common.runners import Venv
 import os
 from pathlib import Path
 import tempfile
+from parquet_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ParquetCache, prefetch
 
 console = Console()
 
@@ -37,6 +39,15 @@ logger = logging.getLogger(__name__)
 SCRIPT_DIR = Path(__file__).parent.absolute()
 PROJECT_ROOT = SCRIPT_DIR.parent
 DBT_PROJECT_PATH = SCRIPT_DIR / "data_swamp_models"
+LOCAL_DB_PATH = SCRIPT_DIR / "filter_data_swamp.duckdb"
+LAKE_CATALOG = SCRIPT_DIR / "lake_catalog.sqlite"
+LAKE_DATA_PATH = SCRIPT_DIR / "lake_data"
+
+# ducklake.build_mode -> dbt target that materializes straight into DuckLake
+DUCKLAKE_DBT_TARGETS = {
+    "local": "ducklake",
+    "motherduck": "motherduck_lake",
+}
 
 # Create local DuckDB pipeline
 pipeline = dlt.pipeline(
@@ -46,9 +57,14 @@ pipeline = dlt.pipeline(
     progress="log"
 )
 
-def execute_pipeline(file_object):
-    """Execute the data pipeline for a given file object."""
+def execute_pipeline(file_object, local_path: Optional[Path] = None):
+    """Execute the data pipeline for a given file object.
+
+    If ``local_path`` is given (a cached copy of the file), it is read instead
+    of the remote ``file_url``.
+    """
     logger.info("Using local DuckDB for data loading and transformation")
+    source_path = str(local_path) if local_path else file_object['file_url']
 
     # Rest of your pipeline code stays the same
     @dlt.resource(max_table_nesting=3, write_disposition="append")
@@ -58,13 +74,13 @@ def execute_pipeline(file_object):
             logger.info(f"Starting data extraction from: {file_object['file_url']}")
             
             # Scan first to get total row count
-            total_rows = pl.scan_parquet(file_object['file_url']).select(pl.count()).collect().item()
+            total_rows = pl.scan_parquet(source_path).select(pl.count()).collect().item()
             logger.info(f"Total rows to process: {total_rows}")
             
             # Process in chunks of 100k rows
             for chunk_start in range(0, total_rows, 100_000):
                 df = pl.scan_parquet(
-                    file_object['file_url'],
+                    source_path,
                     parallel="row_groups",
                     low_memory=True,
                     use_statistics=True,
@@ -118,22 +134,24 @@ def execute_pipeline(file_object):
 
     return pipeline_info
 
+def get_motherduck_token():
+    """Read the MotherDuck token from dlt secrets."""
+    import dlt.common.configuration.specs as specs
+    from dlt.common.configuration import resolve_configuration
+
+    creds = resolve_configuration(
+        specs.ConnectionStringCredentials(),
+        sections=("destination", "motherduck", "credentials")
+    )
+    return creds.password
+
 def setup_ducklake_database():
     """Ensure DuckLake database exists in MotherDuck."""
     logger.info("Checking/creating DuckLake database in MotherDuck...")
     
     try:
-        # Get MotherDuck credentials from dlt config
-        import dlt.common.configuration.specs as specs
-        from dlt.common.configuration import resolve_configuration
-        
         # Get MotherDuck token from secrets
-        creds = resolve_configuration(
-            specs.ConnectionStringCredentials(),
-            sections=("destination", "motherduck", "credentials")
-        )
-        
-        token = creds.password
+        token = get_motherduck_token()
         
         # Connect to MotherDuck
         con = duckdb.connect(f"md:?motherduck_token={token}")
@@ -166,7 +184,7 @@ def export_to_ducklake():
     logger.info("="*80)
     
     # Path to local DuckDB database created by dlt
-    local_db_path = SCRIPT_DIR / "filter_data_swamp.duckdb"
+    local_db_path = LOCAL_DB_PATH
     
     if not local_db_path.exists():
         logger.error(f"Local DuckDB database not found at {local_db_path}")
@@ -223,15 +241,67 @@ def export_to_ducklake():
     
     return info
 
+def run_dbt_into_ducklake(build_mode):
+    """Run dbt with a DuckLake target so models materialize straight into the lake.
+
+    Raw dlt tables are still read from the local DuckDB file, but
+    ``src_sessions_fct`` is written into the attached DuckLake catalog, so no
+    export/copy step is needed afterwards.
+    """
+    target = DUCKLAKE_DBT_TARGETS[build_mode]
+    logger.info(f"Materializing dbt models into DuckLake (target: {target})")
+
+    os.environ["DBT_TARGET"] = target
+    os.environ["DBT_DUCKDB_PATH"] = str(LOCAL_DB_PATH)
+    if build_mode == "local":
+        LAKE_DATA_PATH.mkdir(exist_ok=True)
+        os.environ["DUCKLAKE_CATALOG_PATH"] = str(LAKE_CATALOG)
+        os.environ["DUCKLAKE_DATA_PATH"] = f"{LAKE_DATA_PATH}/"
+    else:
+        setup_ducklake_database()
+        os.environ["MOTHERDUCK_TOKEN"] = get_motherduck_token()
+
+    runner = create_runner(
+        Venv.restore_current(),
+        pipeline.destination_client().config,
+        pipeline.working_dir,
+        str(DBT_PROJECT_PATH),
+        package_profiles_dir=str(DBT_PROJECT_PATH),
+        package_profile_name="gordon_bombay",
+    )
+    return runner.run_all()
+
 if __name__ == '__main__':
     logger.info("Starting data pipeline...")
     logger.info(f"Destination: Local DuckDB")
     logger.info(f"DBT project path: {DBT_PROJECT_PATH}")
     
-    for file_object in filesystem():
+    build_mode = dlt.config.get("ducklake.build_mode", str) or "copy"
+    if build_mode != "copy" and build_mode not in DUCKLAKE_DBT_TARGETS:
+        raise ValueError(
+            f"Unknown ducklake.build_mode {build_mode!r}, expected one of: "
+            f"{', '.join(['copy', *DUCKLAKE_DBT_TARGETS])}"
+        )
+    build_direct = build_mode in DUCKLAKE_DBT_TARGETS
+    
+    files = filesystem()
+    if dlt.config.get("parquet_cache.enabled", bool):
+        cache_dir = dlt.config.get("parquet_cache.cache_dir", str)
+        max_size_mb = dlt.config.get("parquet_cache.max_size_mb", int)
+        prefetch_depth = dlt.config.get("parquet_cache.prefetch_depth", int)
+        cache = ParquetCache(
+            cache_dir=DEFAULT_CACHE_DIR if cache_dir is None else SCRIPT_DIR / cache_dir,
+            max_bytes=DEFAULT_MAX_BYTES if max_size_mb is None else max_size_mb * 1024**2,
+        )
+        logger.info(f"Caching input files in {cache.cache_dir}")
+        files = prefetch(files, cache, depth=2 if prefetch_depth is None else prefetch_depth)
+    else:
+        files = ((file_object, None) for file_object in files)
+
+    for file_object, local_path in files:
         try:
             logger.info(f"Processing file: {file_object['file_url']}")
-            info = execute_pipeline(file_object)
+            info = execute_pipeline(file_object, local_path)
             logger.info(f"File processed: {info}")
         except Exception as e:
             logger.error(f"Failed to process file {file_object['file_url']}: {e}")
@@ -242,11 +312,14 @@ if __name__ == '__main__':
     logger.info("Running dbt transformations...")
     logger.info("="*80)
     
-    dbt = dlt.dbt.package(
-        pipeline, 
-        str(DBT_PROJECT_PATH)
-    )
-    models = dbt.run_all() 
+    if build_direct:
+        models = run_dbt_into_ducklake(build_mode)
+    else:
+        dbt = dlt.dbt.package(
+            pipeline, 
+            str(DBT_PROJECT_PATH)
+        )
+        models = dbt.run_all() 
     for m in models:
         logger.info(
             f"Model {m.model_name} materialized" +
@@ -255,19 +328,22 @@ if __name__ == '__main__':
             f" and message {m.message}"
         )
     
-    # Setup DuckLake database in MotherDuck
-    try:
-        setup_ducklake_database()
-    except Exception as e:
-        logger.warning(f"DuckLake setup warning: {e}")
-    
-    # Export transformed data to DuckLake
-    try:
-        export_to_ducklake()
-    except Exception as e:
-        logger.error(f"Failed to export to DuckLake: {e}")
-        logger.error("The data is still available in local DuckDB at filter_data_swamp.duckdb")
-        raise
+    if build_direct:
+        logger.info("src_sessions_fct built directly in DuckLake, skipping export")
+    else:
+        # Setup DuckLake database in MotherDuck
+        try:
+            setup_ducklake_database()
+        except Exception as e:
+            logger.warning(f"DuckLake setup warning: {e}")
+        
+        # Export transformed data to DuckLake
+        try:
+            export_to_ducklake()
+        except Exception as e:
+            logger.error(f"Failed to export to DuckLake: {e}")
+            logger.error("The data is still available in local DuckDB at filter_data_swamp.duckdb")
+            raise
     
     logger.info("="*80)
     logger.info("✅ Complete pipeline finished successfully!")
@@ -0,0 +1,213 @@
+"""Local read-through cache and prefetcher for remote parquet inputs."""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import fsspec
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+DEFAULT_CACHE_DIR = SCRIPT_DIR / ".parquet_cache"
+DEFAULT_MAX_BYTES = 10 * 1024**3  # 10GB
+
+
+class ParquetCache:
+    """Content-addressed disk cache for immutable remote files.
+
+    Entries are keyed on the file URL plus a version token (etag, or
+    modification date and size when no etag is available), so a rewritten
+    source file gets a fresh entry instead of serving stale bytes. The least
+    recently used entries are evicted once the cache grows past ``max_bytes``.
+
+    Pass ``fs`` to read through any fsspec filesystem (e.g. ``memory`` or
+    ``file``) instead of resolving one from the URL - handy for running
+    against a local directory standing in for GCS. ``fetch`` also accepts a
+    per-call ``fs`` such as the authenticated one carried by dlt file items.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        fs: Optional[fsspec.AbstractFileSystem] = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.fs = fs
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._in_use: Dict[Path, int] = {}
+
+    def _filesystem(
+        self, file_url: str, fs: Optional[fsspec.AbstractFileSystem] = None
+    ) -> Tuple[fsspec.AbstractFileSystem, str]:
+        fs = fs or self.fs
+        if fs is not None:
+            return fs, fs._strip_protocol(file_url)
+        return fsspec.core.url_to_fs(file_url)
+
+    @staticmethod
+    def version_of(file_object: Dict) -> Optional[str]:
+        """Build a version token from a dlt ``filesystem()`` file item."""
+        if file_object.get("etag"):
+            return str(file_object["etag"])
+        if file_object.get("modification_date") is None:
+            return None
+        return f"{file_object['modification_date']}:{file_object.get('size_in_bytes')}"
+
+    def _remote_version(self, fs: fsspec.AbstractFileSystem, path: str) -> str:
+        info = fs.info(path)
+        for field in ("etag", "ETag", "md5Hash", "mtime", "updated", "LastModified"):
+            if info.get(field) is not None:
+                return f"{info[field]}:{info.get('size')}"
+        return str(info.get("size"))
+
+    def path_for(self, file_url: str, version: str) -> Path:
+        """Return the cache location for a given URL and version."""
+        key = hashlib.sha256(f"{file_url}\0{version}".encode()).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}{Path(file_url).suffix}"
+
+    def fetch(
+        self,
+        file_url: str,
+        version: Optional[str] = None,
+        fs: Optional[fsspec.AbstractFileSystem] = None,
+    ) -> Path:
+        """Return a local path for ``file_url``, downloading it on a miss.
+
+        ``fs`` overrides the cache's filesystem for this call. The returned
+        entry is pinned against eviction until ``release`` is called with the
+        same path.
+        """
+        fs, remote_path = self._filesystem(file_url, fs)
+        if version is None:
+            version = self._remote_version(fs, remote_path)
+        local_path = self.path_for(file_url, version)
+
+        with self._lock:
+            self._in_use[local_path] = self._in_use.get(local_path, 0) + 1
+
+        if local_path.exists():
+            logger.info(f"Cache hit: {file_url}")
+            os.utime(local_path)
+            return local_path
+
+        logger.info(f"Cache miss, downloading: {file_url}")
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = local_path.with_name(f"{local_path.name}.{threading.get_ident()}.part")
+        try:
+            fs.get_file(remote_path, str(tmp_path))
+            os.replace(tmp_path, local_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            self.release(local_path)
+            raise
+
+        self._evict()
+        return local_path
+
+    def release(self, local_path: Path) -> None:
+        """Unpin an entry returned by ``fetch`` so it can be evicted."""
+        with self._lock:
+            count = self._in_use.get(local_path, 0) - 1
+            if count > 0:
+                self._in_use[local_path] = count
+            else:
+                self._in_use.pop(local_path, None)
+
+    def size(self) -> int:
+        """Total bytes currently held in the cache."""
+        return sum(p.stat().st_size for p in self._entries())
+
+    def _entries(self) -> Iterator[Path]:
+        for path in self.cache_dir.glob("*/*"):
+            if path.is_file() and not path.name.endswith(".part"):
+                yield path
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for path in self._entries():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                if path in self._in_use:
+                    continue
+                logger.info(f"Evicting cached file: {path.name}")
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+def prefetch(
+    file_objects: Iterable[Dict],
+    cache: ParquetCache,
+    depth: int = 2,
+) -> Iterator[Tuple[Dict, Optional[Path]]]:
+    """Yield ``(file_object, local_path)`` pairs, downloading ahead of the consumer.
+
+    Up to ``depth`` files after the current one are fetched in background
+    threads while the caller transforms the file it was just handed. Each
+    local path stays pinned in the cache until the consumer asks for the next
+    item. A file that fails to download is yielded with a ``None`` path so
+    the caller can fall back to reading it remotely.
+
+    Files are downloaded through the filesystem attached to each dlt file item
+    (``file_object.fsspec``), so the credentials configured for
+    ``filesystem()`` are reused.
+    """
+    file_iter = iter(file_objects)
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=max(depth, 1)) as executor:
+        def submit_next() -> bool:
+            file_object = next(file_iter, None)
+            if file_object is None:
+                return False
+            future = executor.submit(
+                cache.fetch,
+                file_object["file_url"],
+                ParquetCache.version_of(file_object),
+                getattr(file_object, "fsspec", None),
+            )
+            pending.append((file_object, future))
+            return True
+
+        # The queue holds the current file plus ``depth`` files ahead of it
+        for _ in range(depth + 1):
+            if not submit_next():
+                break
+
+        try:
+            while pending:
+                file_object, future = pending.popleft()
+                try:
+                    local_path = future.result()
+                except Exception as e:
+                    logger.warning(f"Prefetch failed for {file_object['file_url']}: {e}")
+                    local_path = None
+                try:
+                    yield file_object, local_path
+                finally:
+                    if local_path is not None:
+                        cache.release(local_path)
+                # Top the queue back up only once the consumer moves on
+                submit_next()
+        finally:
+            for _, future in pending:
+                future.cancel()
+                if not future.cancelled() and future.exception() is None:
+                    cache.release(future.result())
@@ -0,0 +1,224 @@
+"""Opt-in query profiling and slow-query log for the sessions semantic model."""
+
+import inspect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import ibis
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+SLOW_QUERY_LOG_PATH = SCRIPT_DIR / "slow_queries.jsonl"
+DEFAULT_SLOW_QUERY_MS = 1000.0
+
+
+@dataclass
+class QueryProfile:
+    """Everything captured about one profiled semantic-model query."""
+
+    model: str
+    sql: str
+    elapsed_ms: float
+    rows_scanned: Optional[int]
+    rows_returned: int
+    plan: str
+    query: Dict[str, Any] = field(default_factory=dict)
+    cache_hit: Optional[bool] = None
+    rollup: Optional[str] = None
+    profile: Optional[Dict[str, Any]] = None
+    timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+
+def _walk(node: Dict[str, Any], depth: int = 0):
+    yield depth, node
+    for child in node.get("children", []):
+        yield from _walk(child, depth + 1)
+
+
+def _rows_scanned(profile: Dict[str, Any]) -> Optional[int]:
+    if profile.get("cumulative_rows_scanned") is not None:
+        return int(profile["cumulative_rows_scanned"])
+    scanned = [
+        node["operator_rows_scanned"]
+        for _, node in _walk(profile)
+        if node.get("operator_rows_scanned") is not None
+    ]
+    return int(sum(scanned)) if scanned else None
+
+
+def _render_plan(profile: Dict[str, Any]) -> str:
+    """Render the EXPLAIN ANALYZE operator tree as indented text."""
+    lines = []
+    for depth, node in _walk(profile):
+        name = node.get("operator_name") or node.get("operator_type")
+        if not name:
+            continue
+        lines.append(
+            f"{'  ' * (depth - 1)}{name.strip()}"
+            f" rows={node.get('operator_cardinality')}"
+            f" scanned={node.get('operator_rows_scanned')}"
+            f" time={node.get('operator_timing') or 0:.4f}s"
+        )
+    return "\n".join(lines)
+
+
+class ProfiledQuery:
+    """Wraps a ``QueryExpr`` so ``execute()`` goes through the profiler."""
+
+    def __init__(self, query, profiler: "QueryProfiler", model_name: str, spec: Dict[str, Any]):
+        self._query = query
+        self._profiler = profiler
+        self._model_name = model_name
+        self._spec = spec
+
+    def execute(self, *args, **kwargs):
+        return self._profiler.execute(self._query, self._model_name, self._spec, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._query, name)
+
+
+class ProfiledModel:
+    """Wraps a ``SemanticModel`` so every query it builds is profiled."""
+
+    def __init__(self, model, profiler: "QueryProfiler"):
+        self._model = model
+        self._profiler = profiler
+
+    def query(self, *args, **kwargs):
+        query = self._model.query(*args, **kwargs)
+        spec = dict(inspect.signature(self._model.query).bind(*args, **kwargs).arguments)
+        return ProfiledQuery(query, self._profiler, self._model.name, spec)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+class QueryProfiler:
+    """Captures SQL, DuckDB operator profiles and row counts for semantic queries.
+
+    Queries slower than ``threshold_ms`` are appended to a JSON-lines slow-query
+    log so they survive restarts and can be read by other processes (e.g. the
+    MCP server). Profiling is off unless ``enabled`` is set; a disabled
+    profiler hands models back unwrapped.
+    """
+
+    def __init__(
+        self,
+        con,
+        enabled: bool = False,
+        threshold_ms: float = DEFAULT_SLOW_QUERY_MS,
+        log_path: Path = SLOW_QUERY_LOG_PATH,
+        history: int = 100,
+    ):
+        self.con = con
+        self.enabled = enabled
+        self.threshold_ms = threshold_ms
+        self.log_path = Path(log_path)
+        self.recent: deque = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, con, **kwargs) -> "QueryProfiler":
+        """Build a profiler from ``BORING_QUERY_PROFILING`` / ``BORING_SLOW_QUERY_MS``."""
+        threshold_ms = os.getenv("BORING_SLOW_QUERY_MS", DEFAULT_SLOW_QUERY_MS)
+        try:
+            threshold_ms = float(threshold_ms)
+        except ValueError:
+            logger.warning(
+                f"Ignoring invalid BORING_SLOW_QUERY_MS={threshold_ms!r}, "
+                f"using {DEFAULT_SLOW_QUERY_MS} ms"
+            )
+            threshold_ms = DEFAULT_SLOW_QUERY_MS
+        return cls(
+            con,
+            enabled=os.getenv("BORING_QUERY_PROFILING", "").lower() in ("1", "true", "yes"),
+            threshold_ms=threshold_ms,
+            **kwargs,
+        )
+
+    def wrap(self, model):
+        """Return ``model`` with profiling attached, or as-is when disabled."""
+        return ProfiledModel(model, self) if self.enabled else model
+
+    def execute(self, query, model_name: str, spec: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        """Run ``query`` with DuckDB profiling enabled and record the result.
+
+        The query still executes through ibis, so results are identical to an
+        unprofiled run; profiling only observes the raw DuckDB connection.
+        The semantic query is compiled once, outside the timed section.
+        """
+        expr = query.to_expr()
+        sql = str(ibis.to_sql(expr, dialect="duckdb"))
+        raw = self.con.con
+
+        with self._lock, tempfile.TemporaryDirectory() as tmp_dir:
+            profile_path = Path(tmp_dir) / "profile.json"
+            raw.execute("SET enable_profiling = 'json'")
+            raw.execute(f"SET profiling_output = '{profile_path}'")
+            try:
+                start = time.perf_counter()
+                result = expr.execute(*args, **kwargs)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+            finally:
+                raw.execute("RESET enable_profiling")
+                raw.execute("RESET profiling_output")
+            profile = json.loads(profile_path.read_text()) if profile_path.exists() else {}
+
+        record = QueryProfile(
+            model=model_name,
+            sql=sql,
+            elapsed_ms=round(elapsed_ms, 2),
+            rows_scanned=_rows_scanned(profile),
+            rows_returned=len(result),
+            plan=_render_plan(profile),
+            query=spec or {},
+            profile=profile,
+        )
+        self.record(record)
+        return result
+
+    def record(self, record: QueryProfile) -> None:
+        """Keep ``record`` in memory and log it if it crossed the threshold."""
+        self.recent.append(record)
+        logger.info(
+            f"{record.model} query took {record.elapsed_ms:.1f} ms "
+            f"(scanned {record.rows_scanned}, returned {record.rows_returned})"
+        )
+        if record.elapsed_ms < self.threshold_ms:
+            return
+        logger.warning(f"Slow {record.model} query ({record.elapsed_ms:.1f} ms) logged to {self.log_path}")
+        with self._lock, self.log_path.open("a") as f:
+            f.write(json.dumps(asdict(record), default=str) + "\n")
+
+    def recent_queries(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Summarise queries profiled by this process, fast ones included, newest first."""
+        summary = []
+        for record in list(self.recent)[::-1][:limit]:
+            entry = asdict(record)
+            entry.pop("profile", None)
+            summary.append(entry)
+        return summary
+
+    def recent_slow_queries(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Summarise the most recent entries from the slow-query log, newest first."""
+        if not self.log_path.exists():
+            return []
+        with self.log_path.open() as f:
+            lines = deque(f, maxlen=limit)
+        summary = []
+        for line in reversed(lines):
+            entry = json.loads(line)
+            entry.pop("profile", None)
+            summary.append(entry)
+        return summary
@@ -0,0 +1,140 @@
+"""Tests for the parquet read-through cache against a local directory."""
+
+import os
+
+import fsspec
+import pytest
+from fsspec.implementations.local import LocalFileSystem
+
+from parquet_cache import ParquetCache, prefetch
+
+
+class FileItem(dict):
+    """Stand-in for a dlt file item, which carries its own filesystem."""
+
+    fsspec = fsspec.filesystem("file")
+
+
+@pytest.fixture
+def remote(tmp_path):
+    remote_dir = tmp_path / "remote"
+    remote_dir.mkdir()
+    for i in range(4):
+        (remote_dir / f"ga_sessions_{i}.parquet").write_bytes(b"x" * 1000)
+    return remote_dir
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParquetCache(tmp_path / "cache", fs=fsspec.filesystem("file"))
+
+
+def file_items(remote_dir, count=4):
+    return [
+        FileItem(file_url=f"file://{remote_dir}/ga_sessions_{i}.parquet", modification_date="2025-01-01")
+        for i in range(count)
+    ]
+
+
+def test_miss_then_hit(cache, remote):
+    url = f"file://{remote}/ga_sessions_0.parquet"
+
+    first = cache.fetch(url, "v1")
+    (remote / "ga_sessions_0.parquet").unlink()
+    second = cache.fetch(url, "v1")
+
+    assert first == second
+    assert second.read_bytes() == b"x" * 1000
+
+
+def test_new_version_gets_new_entry(cache, remote):
+    url = f"file://{remote}/ga_sessions_0.parquet"
+
+    old = cache.fetch(url, "v1")
+    (remote / "ga_sessions_0.parquet").write_bytes(b"y" * 500)
+    new = cache.fetch(url, "v2")
+
+    assert old != new
+    assert old.read_bytes() == b"x" * 1000
+    assert new.read_bytes() == b"y" * 500
+
+
+def test_lru_eviction_skips_pinned_entries(tmp_path, remote):
+    cache = ParquetCache(tmp_path / "cache", max_bytes=2500, fs=fsspec.filesystem("file"))
+    urls = [f"file://{remote}/ga_sessions_{i}.parquet" for i in range(3)]
+
+    pinned = cache.fetch(urls[0], "v1")
+    released = cache.fetch(urls[1], "v1")
+    cache.release(released)
+    os.utime(pinned, (1, 1))
+    os.utime(released, (2, 2))
+
+    newest = cache.fetch(urls[2], "v1")
+
+    assert pinned.exists()
+    assert not released.exists()
+    assert newest.exists()
+    assert cache.size() == 2000
+
+
+def test_failed_download_yields_none(cache, remote):
+    items = file_items(remote, count=2)
+    (remote / "ga_sessions_0.parquet").unlink()
+
+    results = list(prefetch(items, cache, depth=1))
+
+    assert results[0] == (items[0], None)
+    assert results[1][1].read_bytes() == b"x" * 1000
+    assert cache._in_use == {}
+
+
+def test_prefetch_uses_file_item_filesystem(tmp_path, remote):
+    downloaded = []
+
+    class RecordingFileSystem(LocalFileSystem):
+        def get_file(self, rpath, lpath, **kwargs):
+            downloaded.append(rpath)
+            return super().get_file(rpath, lpath, **kwargs)
+
+    cache = ParquetCache(tmp_path / "cache")
+    items = file_items(remote)
+    for item in items:
+        item.fsspec = RecordingFileSystem()
+
+    paths = [path for _, path in prefetch(items, cache, depth=2)]
+
+    assert all(path.read_bytes() == b"x" * 1000 for path in paths)
+    assert len(set(paths)) == 4
+    assert len(downloaded) == 4
+
+
+@pytest.mark.parametrize("depth", [0, 1, 2])
+def test_prefetch_depth_limits_files_in_flight(cache, remote, depth):
+    items = file_items(remote)
+    pulled = []
+
+    def listing():
+        for item in items:
+            pulled.append(item)
+            yield item
+
+    files = prefetch(listing(), cache, depth=depth)
+
+    next(files)
+    assert len(pulled) == depth + 1
+    assert len(cache._in_use) <= depth + 1
+
+    next(files)
+    assert len(pulled) == depth + 2
+    assert len(cache._in_use) <= depth + 1
+    files.close()
+
+
+def test_close_midway_releases_pins(cache, remote):
+    files = prefetch(file_items(remote), cache, depth=2)
+
+    file_object, local_path = next(files)
+    assert local_path in cache._in_use
+    files.close()
+
+    assert cache._in_use == {}
@@ -0,0 +1,147 @@
+"""Tests for the semantic-model query profiler against in-memory DuckDB."""
+
+import ibis
+import pytest
+from boring_semantic_layer import DimensionSpec, MeasureSpec, SemanticModel
+
+from query_profiler import (
+    DEFAULT_SLOW_QUERY_MS,
+    ProfiledModel,
+    QueryProfile,
+    QueryProfiler,
+    _render_plan,
+    _rows_scanned,
+)
+
+
+@pytest.fixture
+def con():
+    return ibis.duckdb.connect()
+
+
+@pytest.fixture
+def model(con):
+    tbl = con.create_table(
+        "sessions",
+        ibis.memtable({"device": ["desktop", "mobile", "desktop", "tablet"], "pageviews": [1, 2, 3, 4]}),
+    )
+    return SemanticModel(
+        name="sessions",
+        table=tbl,
+        dimensions={"device": DimensionSpec(expr=lambda t: t.device, description="Device")},
+        measures={"total_pageviews": MeasureSpec(expr=lambda t: t.pageviews.sum(), description="Pageviews")},
+    )
+
+
+def make_record(elapsed_ms, sql="SELECT 1"):
+    return QueryProfile(
+        model="sessions", sql=sql, elapsed_ms=elapsed_ms, rows_scanned=10, rows_returned=1, plan=""
+    )
+
+
+PROFILE = {
+    "rows_returned": 2,
+    "children": [
+        {
+            "operator_name": "PROJECTION",
+            "operator_cardinality": 2,
+            "operator_timing": 0.5,
+            "children": [
+                {"operator_name": "SEQ_SCAN ", "operator_cardinality": 7, "operator_rows_scanned": 7},
+                {"operator_type": "TABLE_SCAN", "operator_cardinality": 3, "operator_rows_scanned": 3},
+            ],
+        }
+    ],
+}
+
+
+def test_rows_scanned_prefers_cumulative_counter():
+    assert _rows_scanned({**PROFILE, "cumulative_rows_scanned": 42}) == 42
+
+
+def test_rows_scanned_sums_operators():
+    assert _rows_scanned(PROFILE) == 10
+    assert _rows_scanned({}) is None
+
+
+def test_render_plan_indents_operator_tree():
+    assert _render_plan(PROFILE).splitlines() == [
+        "PROJECTION rows=2 scanned=None time=0.5000s",
+        "  SEQ_SCAN rows=7 scanned=7 time=0.0000s",
+        "  TABLE_SCAN rows=3 scanned=3 time=0.0000s",
+    ]
+
+
+def test_disabled_profiler_returns_model_unwrapped(con, model, tmp_path):
+    profiler = QueryProfiler(con, enabled=False, log_path=tmp_path / "slow.jsonl")
+
+    assert profiler.wrap(model) is model
+
+
+def test_profiled_query_matches_unprofiled_result(con, model, tmp_path):
+    profiler = QueryProfiler(con, enabled=True, log_path=tmp_path / "slow.jsonl")
+    profiled = profiler.wrap(model)
+    assert isinstance(profiled, ProfiledModel)
+
+    result = profiled.query(["device"], ["total_pageviews"], order_by=[("device", "asc")]).execute()
+    expected = model.query(["device"], ["total_pageviews"], order_by=[("device", "asc")]).execute()
+
+    assert result.equals(expected)
+    assert (result.dtypes == expected.dtypes).all()
+
+    record = profiler.recent[-1]
+    assert record.query == {
+        "dimensions": ["device"],
+        "measures": ["total_pageviews"],
+        "order_by": [("device", "asc")],
+    }
+    assert "SELECT" in record.sql
+    assert record.rows_returned == 3
+    assert record.rows_scanned == 4
+    assert "SEQ_SCAN" in record.plan
+
+
+def test_only_queries_over_threshold_are_logged(con, tmp_path):
+    log_path = tmp_path / "slow.jsonl"
+    profiler = QueryProfiler(con, enabled=True, threshold_ms=100, log_path=log_path)
+
+    profiler.record(make_record(50))
+    assert not log_path.exists()
+
+    profiler.record(make_record(150))
+    assert len(log_path.read_text().splitlines()) == 1
+
+
+def test_recent_slow_queries_newest_first_with_limit(con, tmp_path):
+    profiler = QueryProfiler(con, enabled=True, threshold_ms=100, log_path=tmp_path / "slow.jsonl")
+    for i in range(5):
+        profiler.record(make_record(200, sql=f"SELECT {i}"))
+
+    slow = profiler.recent_slow_queries(limit=2)
+
+    assert [q["sql"] for q in slow] == ["SELECT 4", "SELECT 3"]
+    assert all("profile" not in q for q in slow)
+
+
+def test_recent_queries_include_fast_ones(con, tmp_path):
+    profiler = QueryProfiler(con, enabled=True, threshold_ms=100, log_path=tmp_path / "slow.jsonl")
+    profiler.record(make_record(200, sql="SELECT 'slow'"))
+    profiler.record(make_record(5, sql="SELECT 'fast'"))
+    profiler.record(make_record(6, sql="SELECT 'faster'"))
+
+    recent = profiler.recent_queries(limit=2)
+
+    assert [q["sql"] for q in recent] == ["SELECT 'faster'", "SELECT 'fast'"]
+    assert profiler.recent_slow_queries() == [
+        q for q in profiler.recent_queries(limit=10) if q["sql"] == "SELECT 'slow'"
+    ]
+
+
+def test_from_env_ignores_invalid_threshold(con, monkeypatch):
+    monkeypatch.setenv("BORING_QUERY_PROFILING", "1")
+    monkeypatch.setenv("BORING_SLOW_QUERY_MS", "fast please")
+
+    profiler = QueryProfiler.from_env(con)
+
+    assert profiler.enabled
+    assert profiler.threshold_ms == DEFAULT_SLOW_QUERY_MS